@@ -3,78 +3,95 @@
 Analyze applogo.png content bounds and create perfectly centered icon
 """
 
-from PIL import Image, ImageOps
-import numpy as np
+from PIL import Image, ImageChops
+
+from icon_common import (
+    ANCHOR_PATH, LOGO_PATH, load_logo, logo_anchor, reduce_for_resize, save_png, stamped, write_stamp,
+)
+
+OUTPUT_PATH = "app/src/main/res/drawable/ic_launcher_foreground_centered.png"
+
+CANVAS_SIZE = 432
+SAFE_AREA = int(CANVAS_SIZE * 0.55)  # Reduced from 66% to 55% for better breathing room
+# Transparent margin kept around the content, in source logo pixels
+CONTENT_PADDING = 5
 
 def find_content_bounds(image):
-    """Find the actual content bounds (non-transparent area) of the image"""
-    # Convert to numpy array
-    img_array = np.array(image)
-    
-    # If RGBA, use alpha channel to find content
-    if image.mode == 'RGBA':
-        alpha = img_array[:, :, 3]
-        # Find rows and columns that contain non-transparent pixels
-        rows = np.any(alpha > 0, axis=1)
-        cols = np.any(alpha > 0, axis=0)
-    else:
-        # For RGB, find non-white pixels (assuming white background)
-        gray = np.array(image.convert('L'))
-        rows = np.any(gray < 255, axis=1)
-        cols = np.any(gray < 255, axis=0)
-    
-    # Get bounding box
-    top, bottom = np.where(rows)[0][[0, -1]]
-    left, right = np.where(cols)[0][[0, -1]]
-    
-    return (left, top, right + 1, bottom + 1)
+    """Find the actual content bounds of an RGBA image.
 
-def create_perfectly_centered_icon():
-    input_path = "app/src/main/res/drawable/applogo.png"
-    output_path = "app/src/main/res/drawable/ic_launcher_foreground_centered.png"
-    
-    CANVAS_SIZE = 432
-    SAFE_AREA = int(CANVAS_SIZE * 0.55)  # Reduced from 66% to 55% for better breathing room
+    This is the non-transparent area. Fully opaque images (load_logo() converts
+    sources without an alpha channel that way) fall back to the non-white area.
+    """
+    # Pillow's bounding box scan uses the alpha channel directly
+    if image.getchannel('A').getextrema() != (255, 255):
+        return image.getbbox()
+    
+    # For opaque sources, find non-white pixels (assuming white background)
+    return ImageChops.invert(image.convert('L')).getbbox()
+
+def padded_content_box(bounds, size, padding=CONTENT_PADDING):
+    """Grow content bounds by padding pixels, clamped to an image of the given size"""
+    left, top, right, bottom = bounds
+    width, height = size
+    return (max(0, left - padding), max(0, top - padding), min(width, right + padding), min(height, bottom + padding))
+
+def stale_key(shared_size=None):
+    return stamped(OUTPUT_PATH, [LOGO_PATH, __file__], (CANVAS_SIZE, SAFE_AREA, CONTENT_PADDING), shared_size)
+
+def create_perfectly_centered_icon(content=None, shared_size=None):
+    input_path = LOGO_PATH
+    output_path = OUTPUT_PATH
     
     print(f"Analyzing content bounds of {input_path}")
     
-    # Load logo
-    logo = Image.open(input_path)
-    print(f"Original canvas size: {logo.size}")
-    
-    # Find actual content bounds
-    content_bounds = find_content_bounds(logo)
-    left, top, right, bottom = content_bounds
-    content_width = right - left
-    content_height = bottom - top
-    
-    print(f"Content bounds: left={left}, top={top}, right={right}, bottom={bottom}")
-    print(f"Content size: {content_width}x{content_height}")
-    print(f"Original padding: left={left}, top={top}, right={logo.width-right}, bottom={logo.height-bottom}")
-    
-    # Crop to content bounds with a small padding
-    padding = 5
-    crop_left = max(0, left - padding)
-    crop_top = max(0, top - padding)
-    crop_right = min(logo.width, right + padding)
-    crop_bottom = min(logo.height, bottom + padding)
-    
-    # Crop the logo to its actual content
-    logo_cropped = logo.crop((crop_left, crop_top, crop_right, crop_bottom))
-    print(f"Cropped to content size: {logo_cropped.size}")
+    key = stale_key(shared_size)
+    if key is None:
+        return output_path
+    
+    # Emit the visual centering anchor (alpha-weighted centroid) used by resize_app_icon.py
+    center_x, center_y = logo_anchor(input_path)
+    print(f"Visual anchor: ({center_x:.3f}, {center_y:.3f}) in {ANCHOR_PATH}")
+    
+    if content is None:
+        # Load logo
+        logo = load_logo(input_path)
+        print(f"Original canvas size: {logo.size}")
+        
+        # Find actual content bounds
+        content_bounds = find_content_bounds(logo)
+        left, top, right, bottom = content_bounds
+        content_width = right - left
+        content_height = bottom - top
+        
+        print(f"Content bounds: left={left}, top={top}, right={right}, bottom={bottom}")
+        print(f"Content size: {content_width}x{content_height}")
+        print(f"Original padding: left={left}, top={top}, right={logo.width-right}, bottom={logo.height-bottom}")
+        
+        # Crop to content bounds with a small padding
+        # Crop box is applied by the resize itself, no intermediate cropped copy
+        crop_box = padded_content_box(content_bounds, logo.size)
+        crop_width = crop_box[2] - crop_box[0]
+        crop_height = crop_box[3] - crop_box[1]
+    else:
+        # Padded content already cropped (and pre-shrunk) at source scale by icons.py
+        logo, crop_box = content, None
+        crop_width, crop_height = content.size
+    print(f"Cropped to content size: {(crop_width, crop_height)}")
     
     # Create new canvas
     canvas = Image.new("RGBA", (CANVAS_SIZE, CANVAS_SIZE), (0, 0, 0, 0))
     
     # Calculate scaling to fit within safe area
-    logo_ratio = min(SAFE_AREA / logo_cropped.width, SAFE_AREA / logo_cropped.height)
-    new_size = (int(logo_cropped.width * logo_ratio), int(logo_cropped.height * logo_ratio))
+    logo_ratio = min(SAFE_AREA / crop_width, SAFE_AREA / crop_height)
+    new_size = (int(crop_width * logo_ratio), int(crop_height * logo_ratio))
     
     print(f"Scaling ratio: {logo_ratio:.3f}")
     print(f"Final logo size: {new_size}")
     
-    # Resize with high quality
-    logo_resized = logo_cropped.resize(new_size, Image.Resampling.LANCZOS)
+    # Integer reduce() large sources first (it consumes the crop box), then the
+    # high quality LANCZOS resize; without a reduction the crop stays fused into resize()
+    logo, crop_box = reduce_for_resize(logo, new_size, crop_box)
+    logo_resized = logo.resize(new_size, Image.Resampling.LANCZOS, box=crop_box, reducing_gap=3.0)
     
     # Perfect mathematical centering
     x_offset = (CANVAS_SIZE - new_size[0]) // 2
@@ -83,10 +100,12 @@ def create_perfectly_centered_icon():
     print(f"Perfect center position: ({x_offset}, {y_offset})")
     
     # Paste at perfect center
-    canvas.paste(logo_resized, (x_offset, y_offset), logo_resized if logo_resized.mode == 'RGBA' else None)
+    alpha_mask = logo_resized.getchannel('A')
+    canvas.paste(logo_resized, (x_offset, y_offset), alpha_mask)
     
     # Save
-    canvas.save(output_path, "PNG", optimize=True)
+    save_png(canvas, output_path, compress_level=3)
+    write_stamp(output_path, key)
     
     print(f"Perfectly centered icon created: {output_path}")
     return output_path
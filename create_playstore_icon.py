@@ -4,26 +4,42 @@ Create Play Store compliant 512x512 icon from applogo.png
 Meets all Google Play Store requirements for 2025
 """
 
-from PIL import Image, ImageDraw
-import os
+from PIL import Image, ImageColor
+import numpy as np
 
-def create_playstore_icon():
+from icon_common import (
+    LOGO_PATH, fit_logo, get_logo, save_png, stamped, write_stamp,
+)
+
+OUTPUT_PATH = "app/src/main/ic_launcher-playstore.png"
+
+# Play Store requirements
+PLAYSTORE_SIZE = 512
+BACKGROUND_COLOR = "#1E3A8A"  # Blue background from ic_launcher_background
+
+def stale_key(shared_size=None):
+    return stamped(OUTPUT_PATH, [LOGO_PATH, __file__], (PLAYSTORE_SIZE, BACKGROUND_COLOR), shared_size)
+
+def create_playstore_icon(logo=None, shared_size=None):
     # Input and output paths
-    input_path = "app/src/main/res/drawable/applogo.png"
-    output_path = "app/src/main/ic_launcher-playstore.png"
-    
-    # Play Store requirements
-    PLAYSTORE_SIZE = 512
-    BACKGROUND_COLOR = "#1E3A8A"  # Blue background from ic_launcher_background
+    input_path = LOGO_PATH
+    output_path = OUTPUT_PATH
     
     print(f"Creating Play Store icon from {input_path}")
     
-    # Load the source logo
-    logo = Image.open(input_path)
+    key = stale_key(shared_size)
+    if key is None:
+        return True
+    
+    # Load the source logo, unless icons.py passed in its pre-shrunk one
+    if logo is None:
+        logo = get_logo(input_path)
     print(f"Source logo size: {logo.size}")
     
-    # Create 512x512 canvas with blue background
-    playstore_icon = Image.new("RGBA", (PLAYSTORE_SIZE, PLAYSTORE_SIZE), BACKGROUND_COLOR)
+    # Create 512x512 RGB canvas with blue background (no alpha, as recommended by Play Store)
+    background = np.array(ImageColor.getrgb(BACKGROUND_COLOR), dtype=np.float32)
+    canvas = np.empty((PLAYSTORE_SIZE, PLAYSTORE_SIZE, 3), dtype=np.uint8)
+    canvas[:] = background
     
     # Calculate scaling to fit logo properly (with padding for safe area)
     # Leave 20% margin for circular cropping on some launchers
@@ -34,21 +50,26 @@ def create_playstore_icon():
     new_logo_size = (int(logo.width * logo_ratio), int(logo.height * logo_ratio))
     
     # Resize logo with high quality
-    logo_resized = logo.resize(new_logo_size, Image.Resampling.LANCZOS)
+    logo_resized = fit_logo(logo, new_logo_size)
+    new_logo_size = logo_resized.size
     
     # Center the logo on the canvas
     x_offset = (PLAYSTORE_SIZE - new_logo_size[0]) // 2
     y_offset = (PLAYSTORE_SIZE - new_logo_size[1]) // 2
     
-    # Paste logo onto background
-    playstore_icon.paste(logo_resized, (x_offset, y_offset), logo_resized if logo_resized.mode == 'RGBA' else None)
-    
-    # Convert to RGB (remove alpha) as recommended by Play Store
-    final_icon = Image.new("RGB", (PLAYSTORE_SIZE, PLAYSTORE_SIZE), BACKGROUND_COLOR)
-    final_icon.paste(playstore_icon, (0, 0))
+    # Blend logo onto the solid blue: out = fg * a + bg * (1 - a)
+    # Only the logo's rectangle is touched, not the whole canvas
+    logo_array = np.asarray(logo_resized, dtype=np.float32)
+    alpha = logo_array[..., 3:4] / 255.0
+    blended = logo_array[..., :3] * alpha + background * (1.0 - alpha)
+    canvas[y_offset:y_offset + new_logo_size[1], x_offset:x_offset + new_logo_size[0]] = (blended + 0.5).astype(np.uint8)
+    playstore_icon = Image.fromarray(canvas)
     
     # Save as 32-bit PNG 
-    final_icon.save(output_path, "PNG", optimize=True, quality=100)
+    # Full optimize pass is kept here since this file is shipped to the Play Console;
+    # the per-build foreground icons use a fast compress_level instead
+    save_png(playstore_icon, output_path, optimize=True, quality=100)
+    write_stamp(output_path, key)
     
     print(f"✅ Play Store icon created: {output_path}")
     print(f"✅ Size: {PLAYSTORE_SIZE}x{PLAYSTORE_SIZE} pixels")
@@ -0,0 +1,174 @@
+"""
+Shared helpers for the app icon generation scripts
+"""
+
+import functools
+import hashlib
+import io
+import json
+import os
+
+from PIL import Image
+import numpy as np
+
+LOGO_PATH = "app/src/main/res/drawable/applogo.png"
+# Kept out of res/ (aapt rejects stray files there); wiped by a gradle clean
+STAMP_DIR = "app/build/icon_stamps"
+# Visual centering anchor of applogo.png (also can't live in res/)
+ANCHOR_PATH = "applogo.anchor.json"
+# Bump whenever compute_anchor() changes so existing sidecars are recomputed
+ANCHOR_VERSION = 1
+# icons.py prepares the shared sources for "all" mode, so it feeds those stamps
+ICONS_SCRIPT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "icons.py")
+
+@functools.lru_cache(maxsize=None)
+def _decode_logo(path):
+    logo = Image.open(path)
+    logo.load()
+    return logo.convert("RGBA")
+
+def load_logo(path=LOGO_PATH):
+    """Decode the logo once and cache it as an RGBA image.
+
+    The cache is keyed on the absolute path, so load_logo(), load_logo(LOGO_PATH)
+    and load_logo(path=...) all share one decode. Callers must not modify the
+    result; use get_logo() for a private copy.
+    """
+    return _decode_logo(os.path.abspath(path))
+
+def get_logo(path=LOGO_PATH):
+    """Return a private copy of the cached logo"""
+    return load_logo(path).copy()
+
+def reduce_for_resize(image, size, box=None):
+    """Cheaply box-reduce image by an integer factor ahead of a LANCZOS resize to size.
+
+    Returns the image and the crop box to pass on to resize(); the box is
+    consumed here whenever a reduction happens.
+    """
+    source_size = image.size if box is None else (box[2] - box[0], box[3] - box[1])
+    factor = max(1, min(source_size) // (2 * max(size)))
+    if factor == 1:
+        return image, box
+    return image.reduce(factor, box=box), None
+
+def fit_logo(logo, size):
+    """LANCZOS-resize logo to size and return the result (its size may differ from size by rounding).
+
+    Downscales shrink logo in place via thumbnail(), so callers must pass an
+    image they own; thumbnail() never enlarges, so upscales go through resize().
+    """
+    if size[0] <= logo.width and size[1] <= logo.height:
+        logo.thumbnail(size, Image.Resampling.LANCZOS, reducing_gap=2.0)
+        return logo
+    return logo.resize(size, Image.Resampling.LANCZOS)
+
+def shrink_logo(logo, max_side):
+    """Downscale logo once so its longest side is max_side, for sharing between generators.
+
+    Always returns a new image the caller owns; logos already within max_side
+    are copied unchanged rather than upscaled.
+    """
+    scale = max_side / max(logo.size)
+    if scale >= 1:
+        return logo.copy()
+    size = (max(1, round(logo.width * scale)), max(1, round(logo.height * scale)))
+    logo, _ = reduce_for_resize(logo, size)
+    return logo.resize(size, Image.Resampling.LANCZOS)
+
+def save_png(image, path, **params):
+    """Encode image as PNG in memory, then write it to path in a single call"""
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG", **params)
+    with open(path, "wb") as f:
+        f.write(buffer.getbuffer())
+
+def build_key(paths, config):
+    """Hash the given input files (source logo, generator script) plus config constants.
+
+    This module is always hashed too, since every generator's output depends on it.
+    """
+    digest = hashlib.sha256()
+    for path in [*paths, __file__]:
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    digest.update(repr(config).encode())
+    return digest.hexdigest()
+
+def _stamp_path(output_path):
+    return os.path.join(STAMP_DIR, os.path.basename(output_path) + ".stamp")
+
+def is_up_to_date(output_path, key):
+    """True if output_path exists and was last generated from inputs hashing to key"""
+    if not os.path.exists(output_path):
+        return False
+    try:
+        with open(_stamp_path(output_path)) as f:
+            return f.read() == key
+    except OSError:
+        return False
+
+def write_stamp(output_path, key):
+    """Record the key output_path was generated from"""
+    os.makedirs(STAMP_DIR, exist_ok=True)
+    with open(_stamp_path(output_path), "w") as f:
+        f.write(key)
+
+def stamped(output_path, paths, config, shared_size=None):
+    """Return the key to regenerate output_path under, or None if it is already up to date.
+
+    The key covers the given input files and config constants (see build_key).
+    shared_size is the size icons.py pre-shrank the logo to, or None for a
+    standalone run; the two produce different pixels, so they stamp differently.
+    Shared-mode keys also hash icons.py, whose source preparation shapes them.
+    """
+    if shared_size is not None:
+        paths = [*paths, ICONS_SCRIPT_PATH]
+    key = build_key(paths, (*config, shared_size))
+    if is_up_to_date(output_path, key):
+        print(f"Up to date, skipping: {output_path}")
+        return None
+    return key
+
+def compute_anchor(logo):
+    """Alpha-weighted centroid of an RGBA logo, as fractions of its width and height"""
+    # Reduce the uint8 plane straight into per-column/per-row totals;
+    # no full-size widened copy of the alpha channel is materialised
+    alpha = np.asarray(logo.getchannel("A"))
+    col_weights = alpha.sum(axis=0, dtype=np.uint64)
+    row_weights = alpha.sum(axis=1, dtype=np.uint64)
+    total = float(col_weights.sum())
+    center_x = col_weights @ (np.arange(logo.width) + 0.5) / total / logo.width
+    center_y = row_weights @ (np.arange(logo.height) + 0.5) / total / logo.height
+    return float(center_x), float(center_y)
+
+def logo_anchor(path=LOGO_PATH, anchor_path=ANCHOR_PATH, logo=None):
+    """Return the (center_x, center_y) anchor of the logo from its JSON sidecar.
+
+    The sidecar records the hash of the logo and the ANCHOR_VERSION it was
+    computed with, and is recomputed and rewritten whenever either has changed;
+    pass the already decoded logo to recompute from it instead of loading path.
+    """
+    with open(path, "rb") as f:
+        source_sha256 = hashlib.sha256(f.read()).hexdigest()
+    try:
+        with open(anchor_path) as f:
+            anchor = json.load(f)
+        if anchor["source_sha256"] == source_sha256 and anchor["version"] == ANCHOR_VERSION:
+            return anchor["center_x"], anchor["center_y"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    if logo is None:
+        logo = load_logo(path)
+    center_x, center_y = compute_anchor(logo)
+    anchor = {
+        "version": ANCHOR_VERSION, "source_sha256": source_sha256, "center_x": center_x, "center_y": center_y,
+    }
+    # Write atomically; generators may read the sidecar from parallel processes
+    temp_path = f"{anchor_path}.{os.getpid()}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump(anchor, f, indent=2)
+        f.write("\n")
+    os.replace(temp_path, anchor_path)
+    return center_x, center_y
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Regenerate app icons from applogo.png in a single interpreter
+
+    python -m icons all|centered|playstore|foreground
+
+For "all", the logo is decoded and shrunk once, then the generators run in parallel
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import analyze_and_center as centered_icon
+import create_playstore_icon as playstore_icon
+from icon_common import load_logo, logo_anchor, shrink_logo
+import resize_app_icon as foreground_icon
+
+# Largest output canvas (Play Store icon); every generator scales below this
+SHARED_LOGO_SIZE = 512
+
+ICON_MODULES = {
+    "centered": centered_icon,
+    "playstore": playstore_icon,
+    "foreground": foreground_icon,
+}
+
+GENERATORS = {
+    "centered": centered_icon.create_perfectly_centered_icon,
+    "playstore": playstore_icon.create_playstore_icon,
+    "foreground": foreground_icon.create_app_icon_foreground,
+}
+
+def build_all():
+    # Check every stamp up front so a no-op build never decodes the logo or starts workers
+    stale = [name for name, module in ICON_MODULES.items() if module.stale_key(SHARED_LOGO_SIZE)]
+    if not stale:
+        print("All icons up to date, skipping")
+        return
+
+    # Pay for the expensive LANCZOS pass over the full-size logo only once per source:
+    # the whole logo for the Play Store/foreground icons, and the padded content crop
+    # (cut at source scale, so padding and resolution match a standalone run) for the
+    # centered icon
+    logo = load_logo()
+    sources = {}
+
+    # Refresh a stale anchor sidecar here, from the already decoded logo, so the
+    # centered/foreground workers only read it instead of each decoding the logo
+    logo_anchor(logo=logo)
+    if "centered" in stale:
+        content_box = centered_icon.padded_content_box(centered_icon.find_content_bounds(logo), logo.size)
+        sources["centered"] = shrink_logo(logo.crop(content_box), SHARED_LOGO_SIZE)
+    if "playstore" in stale or "foreground" in stale:
+        # Both generators shrink their source in place, so each gets its own image
+        shared_logo = shrink_logo(logo, SHARED_LOGO_SIZE)
+        sources["playstore"] = shared_logo
+        sources["foreground"] = shared_logo.copy()
+
+    # Generators are independent, so resize/encode/write overlap on separate cores
+    with ProcessPoolExecutor(len(stale)) as executor:
+        futures = [executor.submit(GENERATORS[name], sources[name], SHARED_LOGO_SIZE) for name in stale]
+        for future in futures:
+            future.result()
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate app icons from applogo.png")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("all", help="generate every icon")
+    subparsers.add_parser("centered", help="ic_launcher_foreground_centered.png")
+    subparsers.add_parser("playstore", help="ic_launcher-playstore.png (512x512)")
+    subparsers.add_parser("foreground", help="ic_launcher_foreground_resized.png")
+    args = parser.parse_args()
+
+    if args.command == "all":
+        build_all()
+    else:
+        GENERATORS[args.command]()
+
+if __name__ == "__main__":
+    try:
+        main()
+        print("\nIcon generation SUCCESSFUL!")
+    except Exception as e:
+        print(f"Error generating icons: {e}")
+        exit(1)
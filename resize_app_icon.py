@@ -4,22 +4,35 @@ Create properly sized app icon foreground from applogo.png
 For adaptive icon system (108dp canvas with safe area)
 """
 
-from PIL import Image, ImageDraw
-import os
+from PIL import Image
 
-def create_app_icon_foreground():
+from icon_common import (
+    LOGO_PATH, fit_logo, get_logo, logo_anchor, save_png, stamped, write_stamp,
+)
+
+OUTPUT_PATH = "app/src/main/res/drawable/ic_launcher_foreground_resized.png"
+
+# Adaptive icon specs
+CANVAS_SIZE = 432  # 108dp at xxxhdpi (4x) density
+SAFE_AREA = int(CANVAS_SIZE * 0.66)  # Safe area is 66% of canvas
+
+def stale_key(shared_size=None):
+    return stamped(OUTPUT_PATH, [LOGO_PATH, __file__], (CANVAS_SIZE, SAFE_AREA), shared_size)
+
+def create_app_icon_foreground(logo=None, shared_size=None):
     # Input and output paths
-    input_path = "app/src/main/res/drawable/applogo.png"
-    output_path = "app/src/main/res/drawable/ic_launcher_foreground_resized.png"
-    
-    # Adaptive icon specs
-    CANVAS_SIZE = 432  # 108dp at xxxhdpi (4x) density
-    SAFE_AREA = int(CANVAS_SIZE * 0.66)  # Safe area is 66% of canvas
+    input_path = LOGO_PATH
+    output_path = OUTPUT_PATH
     
     print(f"Resizing logo for adaptive icon: {input_path}")
     
+    key = stale_key(shared_size)
+    if key is None:
+        return output_path
+    
     # Load the source logo
-    logo = Image.open(input_path)
+    if logo is None:
+        logo = get_logo(input_path)
     print(f"Original logo size: {logo.size}")
     
     # Create transparent canvas
@@ -33,24 +46,24 @@ def create_app_icon_foreground():
     print(f"New logo size: {new_logo_size}")
     
     # Resize logo with high quality
-    logo_resized = logo.resize(new_logo_size, Image.Resampling.LANCZOS)
-    
-    # Center the logo on the canvas with fine-tuning for perfect centering
-    x_offset = (CANVAS_SIZE - new_logo_size[0]) // 2
-    y_offset = (CANVAS_SIZE - new_logo_size[1]) // 2
+    logo_resized = fit_logo(logo, new_logo_size)
+    new_logo_size = logo_resized.size
     
-    # Fine-tune positioning to ensure perfect centering
-    # Move slightly up and left to compensate for visual weight
-    x_offset -= 2  # Adjust horizontally 
-    y_offset -= 5  # Adjust vertically to account for text being heavier at bottom
+    # Center the logo's visual weight (from the applogo.anchor.json sidecar) rather
+    # than its bounding box, since the text makes the bottom of the logo heavier
+    center_x, center_y = logo_anchor(input_path)
+    x_offset = (CANVAS_SIZE - new_logo_size[0]) // 2 - round((center_x - 0.5) * new_logo_size[0])
+    y_offset = (CANVAS_SIZE - new_logo_size[1]) // 2 - round((center_y - 0.5) * new_logo_size[1])
     
     print(f"Positioning at: ({x_offset}, {y_offset})")
     
     # Paste logo onto transparent canvas
-    canvas.paste(logo_resized, (x_offset, y_offset), logo_resized if logo_resized.mode == 'RGBA' else None)
+    alpha_mask = logo_resized.getchannel('A')
+    canvas.paste(logo_resized, (x_offset, y_offset), alpha_mask)
     
     # Save as PNG with transparency
-    canvas.save(output_path, "PNG", optimize=True)
+    save_png(canvas, output_path, compress_level=3)
+    write_stamp(output_path, key)
     
     print(f"App icon foreground created: {output_path}")
     print(f"Canvas size: {CANVAS_SIZE}x{CANVAS_SIZE} pixels")